@@ -1,19 +1,34 @@
 import json
 import os
+import re
 import subprocess
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import cmd2
 from json_manager.buffered_cmd2 import BufferedCmd  # Updated import
-import requests  # For downloading JSON from a URL
 from tinydb import TinyDB, Query  # For database operations
 from tinydb.storages import JSONStorage
+try:
+    import orjson  # Faster JSON parsing/serialization
+except ImportError:
+    orjson = None
 # from tinydb.storages import MemoryStorage
-# from tinydb.middlewares import CachingMiddleware
-from thefuzz import fuzz  # For fuzzy matching score
+from tinydb.middlewares import CachingMiddleware  # Batches writes in memory until flushed
+try:
+    from rapidfuzz import fuzz, process  # C++ implementation of the thefuzz scorers
+except ImportError:
+    from thefuzz import fuzz  # For fuzzy matching score
+    process = None
+try:
+    import numpy as np  # Needed by rapidfuzz's process.cdist
+except ImportError:
+    np = None
 from dotenv import load_dotenv  # For loading environment variables from .env
 
-from json_manager.main import download_json
+from json_manager.json_io import (
+    HTTP_TIMEOUT, NO_DATA, compile_path, dumps, get_http_session, loads_utf8_replace, read_json_file
+)
+from json_manager.main import temp_json_path
 
 CMD_CATEGORY = "JSON Manager"
 
@@ -21,28 +36,69 @@ CMD_CATEGORY = "JSON Manager"
 class UTF8ReplaceJSONStorage(JSONStorage):
     """
     Custom TinyDB storage that forces UTF-8 reading with error replacement.
+    The file is opened in binary mode once and that handle is reused for every read and write.
     """
+    def __init__(self, path: str, **kwargs) -> None:
+        kwargs.setdefault("access_mode", "rb+")
+        super().__init__(path, **kwargs)
+
+    def loads(self, raw: bytes) -> Any:
+        return json.loads(raw.decode("utf-8", errors="replace"))
+
+    def dumps(self, data: Dict[str, Dict[str, Any]]) -> bytes:
+        return json.dumps(data, **self.kwargs).encode("utf-8")
+
     def read(self) -> Any:
-        try:
-            with open(self._handle.name, 'r', encoding='utf-8', errors='replace') as fh:
-                return json.load(fh)
-        except FileNotFoundError:
+        self._handle.seek(0)
+        raw = self._handle.read()
+        if not raw:
             return None
+        return self.loads(raw)
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        self._handle.seek(0)
+        self._handle.write(self.dumps(data))
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._handle.truncate()
 
 
-def get_nested_value(record: Dict[str, Any], field_path: str) -> Optional[Any]:
+class OrjsonUTF8Storage(UTF8ReplaceJSONStorage):
     """
-    Retrieve a nested value from a dictionary given a dot-separated field path.
-    For example, get_nested_value(record, "int.hello") returns record["int"]["hello"] if it exists.
+    TinyDB storage that parses and serializes with orjson, replacing invalid UTF-8 on read.
     """
-    parts = field_path.split(".")
-    current = record
-    for part in parts:
-        if isinstance(current, dict) and part in current:
-            current = current[part]
-        else:
-            return None
-    return current
+    def loads(self, raw: bytes) -> Any:
+        return loads_utf8_replace(raw)
+
+    def dumps(self, data: Dict[str, Dict[str, Any]]) -> bytes:
+        return dumps(data, indent=True)
+
+
+# Storage used for every TinyDB opened by the console
+DB_STORAGE = OrjsonUTF8Storage if orjson is not None else UTF8ReplaceJSONStorage
+
+
+def write_json_file(path: str, data: Any) -> None:
+    """
+    Serialize data to a JSON file.
+    """
+    with open(path, "wb") as f:
+        f.write(dumps(data, indent=True))
+
+
+def get_trigrams(text: str) -> Set[str]:
+    """
+    Return the set of distinct 3-character substrings of text.
+    Strings shorter than three characters have no trigrams.
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def format_record(record: Any) -> str:
+    """
+    Pretty-print a record for display. Uses orjson (2-space indent) when available.
+    """
+    return dumps(record, indent=True).decode("utf-8")
 
 
 def convert_to_tinydb_format(data: List[Dict[str, Any]], original_filename: str) -> Optional[str]:
@@ -55,15 +111,18 @@ def convert_to_tinydb_format(data: List[Dict[str, Any]], original_filename: str)
     The converted file is saved as "originalfilename.db.json" in the same directory.
     Returns the new filename if successful.
     """
-    new_data = {"_default": {}}
-    for i, record in enumerate(data, start=1):
-        new_data["_default"][str(i)] = record
-
     base, _ = os.path.splitext(original_filename)
     new_filename = base + ".db.json"
     try:
-        with open(new_filename, "w", encoding="utf-8", errors="replace") as f:
-            json.dump(new_data, f, ensure_ascii=False, indent=4)
+        # Stream one record at a time instead of building a second copy of the whole dataset
+        with open(new_filename, "wb") as f:
+            f.write(b'{\n  "_default": {')
+            for i, record in enumerate(data, start=1):
+                f.write(b',\n    "' if i > 1 else b'\n    "')
+                f.write(str(i).encode("ascii"))
+                f.write(b'": ')
+                f.write(dumps(record))
+            f.write(b"\n  }\n}\n")
         return new_filename
     except Exception as e:
         print(f"Error saving converted file: {e}")
@@ -88,6 +147,12 @@ class Console(BufferedCmd):
         self.db: Optional[TinyDB] = None
         self.file_path: Optional[str] = None
 
+        # Per-field caches and fuzzy_search indexes, built on first use and cleared whenever the data changes
+        self._strval_cache: Dict[str, Dict[int, Tuple[Dict[str, Any], Any, str]]] = {}  # field -> doc_id -> (record, field_val, str)
+        self._trigram_index: Dict[str, Dict[str, Set[int]]] = {}  # field -> trigram -> doc_ids
+        self._len_index: Dict[str, Dict[int, List[int]]] = {}  # field -> len(str) -> doc_ids
+        self._neofuzz: Dict[str, Tuple[Any, Dict[str, List[int]]]] = {}  # field -> (Neofuzz process, str -> doc_ids)
+
     def ensure_db(self) -> bool:
         """
         Ensure that the database is loaded. If not, try to load it from the stored file_path.
@@ -96,7 +161,8 @@ class Console(BufferedCmd):
         if self.db is None:
             if self.file_path and os.path.exists(self.file_path):
                 try:
-                    self.db = TinyDB(self.file_path, storage=UTF8ReplaceJSONStorage)
+                    self.db = TinyDB(self.file_path, storage=CachingMiddleware(DB_STORAGE))
+                    self.clear_indexes()
                     # https://tinydb.readthedocs.io/en/latest/usage.html
                     # self.db = TinyDB(self.file_path, storage=CachingMiddleware(MemoryStorage))
                     # db = TinyDB(self.file_path, sort_keys=True, indent=4, separators=(',', ': '))
@@ -110,7 +176,7 @@ class Console(BufferedCmd):
                 return False
         return True
 
-    def load_json(self, source: str) -> None:
+    def load_json(self, source: str, data: Any = NO_DATA) -> None:
         """
         Load JSON data from a local file or a URL and initialize TinyDB.
         If the data is a list, it is converted into TinyDB format and saved as "filename.db.json"
@@ -119,21 +185,24 @@ class Console(BufferedCmd):
         whose value is a dict). Otherwise, a warning is printed and the original file_path is retained.
         
         :param source: Path to a local JSON file or a URL pointing to JSON data.
+        :param data: The already parsed contents of the local file `source`, which is then not read again.
         """
-        data = None
+        downloaded = False
         # Save previous file path in case of error
         previous_file_path = self.file_path
+        # Make sure pending writes are on disk before (re)reading any file
+        self.flush_db()
 
-        if source.startswith("http://") or source.startswith("https://"):
+        if data is not NO_DATA:
+            self.file_path = source
+        elif source.startswith("http://") or source.startswith("https://"):
             try:
-                response = requests.get(source)
+                response = get_http_session().get(source, timeout=HTTP_TIMEOUT)
                 response.raise_for_status()
-                data = response.json()
-                # Save downloaded JSON temporarily as "downloaded.json"
-                # self.file_path = "downloaded.json"
-                # with open(self.file_path, "w", encoding="utf-8", errors="replace") as f:
-                #     json.dump(data, f, ensure_ascii=False, indent=4)
-                self.file_path = download_json(url=source)
+                # Parse the body once; it is written to the temp directory below, after the format check
+                data = loads_utf8_replace(response.content) if orjson is not None else response.json()
+                self.file_path = temp_json_path(source)
+                downloaded = True
             except Exception as e:
                 self.perror(f"Error downloading JSON: {e}")
                 self.file_path = previous_file_path
@@ -141,8 +210,7 @@ class Console(BufferedCmd):
         else:
             self.file_path = source
             try:
-                with open(source, "r", encoding="utf-8", errors="replace") as f:
-                    data = json.load(f)
+                data = read_json_file(source)
             except Exception as e:
                 self.perror(f"Error reading JSON file: {e}")
                 self.file_path = previous_file_path
@@ -163,6 +231,13 @@ class Console(BufferedCmd):
                 self.perror("JSON file is not in TinyDB compatible format. It must have a '_default' key with a dict value.")
                 self.file_path = previous_file_path
                 return
+            if downloaded:
+                try:
+                    write_json_file(self.file_path, data)
+                except Exception as e:
+                    self.perror(f"Error saving downloaded JSON: {e}")
+                    self.file_path = previous_file_path
+                    return
         else:
             self.perror("Unsupported JSON format.")
             self.file_path = previous_file_path
@@ -170,12 +245,117 @@ class Console(BufferedCmd):
 
         # Load the TinyDB database using our custom storage
         try:
-            self.db = TinyDB(self.file_path, storage=UTF8ReplaceJSONStorage)
+            db = TinyDB(self.file_path, storage=CachingMiddleware(DB_STORAGE))
+            # Hand the parsed data to the cache instead of letting TinyDB read the file again
+            if isinstance(data, list):
+                data = {"_default": {str(i): record for i, record in enumerate(data, start=1)}}
+            db.storage.cache = data
+            self.close_db()
+            self.db = db
+            self.clear_indexes()
             self.poutput("JSON data loaded successfully into TinyDB.")
         except Exception as e:
             self.perror(f"Error loading JSON file into TinyDB: {e}")
             self.file_path = previous_file_path
 
+    def flush_db(self) -> None:
+        """
+        Write any changes cached by CachingMiddleware to the database file.
+        """
+        if self.db is not None:
+            self.db.storage.flush()
+
+    def close_db(self) -> None:
+        """
+        Flush and close the database. It is re-read from file_path on next use.
+        """
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def postloop(self) -> None:
+        """
+        Flush cached writes once the command loop (or a batch of executed commands) ends.
+        """
+        self.flush_db()
+        super().postloop()
+
+    def clear_indexes(self) -> None:
+        """
+        Drop the cached field values and fuzzy_search indexes so they are rebuilt from the current database.
+        Neofuzz indexes are dropped as well and must be rebuilt with fuzzy_index.
+        """
+        self._strval_cache.clear()
+        self._trigram_index.clear()
+        self._len_index.clear()
+        self._neofuzz.clear()
+
+    def field_values(self, field: str) -> Dict[int, Tuple[Dict[str, Any], Any, str]]:
+        """
+        Return doc_id -> (record, field_val, str(field_val)) for every record that has the field.
+        Cached across commands, so values are only looked up and stringified once per load.
+        """
+        values = self._strval_cache.get(field)
+        if values is None:
+            values = {}
+            accessor = compile_path(field)
+            # Iterate the raw table rather than db.all() to skip wrapping every record as a Document
+            table = self.db.table(self.db.default_table_name)
+            for doc_id, record in table._read_table().items():
+                field_val = accessor(record)
+                if field_val is not None:
+                    # Most searchable values are already strings; skip the str() call for those
+                    str_val = field_val if type(field_val) is str else str(field_val)
+                    values[int(doc_id)] = (record, field_val, str_val)
+            self._strval_cache[field] = values
+        return values
+
+    def build_fuzzy_index(self, field: str) -> None:
+        """
+        Index the stringified values of a field for fuzzy_search by the trigrams they contain and their lengths.
+        """
+        trigram_index: Dict[str, Set[int]] = {}
+        len_index: Dict[int, List[int]] = {}
+        for doc_id, (_, _, str_val) in self.field_values(field).items():
+            for gram in get_trigrams(str_val):
+                trigram_index.setdefault(gram, set()).add(doc_id)
+            len_index.setdefault(len(str_val), []).append(doc_id)
+        self._trigram_index[field] = trigram_index
+        self._len_index[field] = len_index
+
+    def fuzzy_candidates(self, field: str, search_term: str, threshold: int) -> List[int]:
+        """
+        Return the doc_ids whose value for field can still reach the fuzz.ratio threshold.
+        Scores are rounded before they are compared, so the bounds below allow for a score of threshold - 0.5.
+        Candidates are skipped only when that is provably impossible:
+          - fuzz.ratio is at most 200 * min_len / (len1 + len2), so whole length buckets are dropped.
+          - A match needs an indel distance <= max_dist, and by the q-gram lemma such strings
+            share at least max_len - 2 - 3 * max_dist trigrams. Where that bound is positive,
+            only records sharing a trigram with the query are kept.
+        """
+        if field not in self._trigram_index:
+            self.build_fuzzy_index(field)
+
+        shared: Set[int] = set()
+        trigram_index = self._trigram_index[field]
+        for gram in get_trigrams(search_term):
+            shared.update(trigram_index.get(gram, ()))
+
+        query_len = len(search_term)
+        candidates: List[int] = []
+        for cand_len, doc_ids in self._len_index[field].items():
+            total = query_len + cand_len
+            # 200 * min_len / total < threshold - 0.5, in integers
+            if total and 400 * min(query_len, cand_len) < (2 * threshold - 1) * total:
+                continue
+            # Largest indel distance d with 100 * (total - d) / total >= threshold - 0.5
+            max_dist = total * (201 - 2 * threshold) // 200
+            if max(query_len, cand_len) - 2 - 3 * max_dist >= 1:
+                candidates.extend(doc_id for doc_id in doc_ids if doc_id in shared)
+            else:
+                candidates.extend(doc_ids)
+        return candidates
+
     load_parser = cmd2.Cmd2ArgumentParser()
     load_parser.add_argument("source", help="Local file path or URL of the JSON file")
     
@@ -199,8 +379,10 @@ class Console(BufferedCmd):
             return
 
         try:
-            record: Dict[str, Any] = json.loads(record_str)
+            # Read like the database file, so NaN literals are written back as NaN
+            record: Dict[str, Any] = loads_utf8_replace(record_str)
             self.db.insert(record)
+            self.clear_indexes()
             self.poutput("Record inserted successfully.")
         except json.JSONDecodeError:
             self.perror("Invalid JSON record provided.")
@@ -276,45 +458,54 @@ class Console(BufferedCmd):
         else:
             search_value = args.value
 
-        results_found = False
-        for record in self.db.all():
-            for field in args.field:
-                field_val = get_nested_value(record, field)
-                if field_val is not None:
-                    str_field_val = str(field_val)
-                    if args.regex:
-                        if re.search(search_value, str_field_val):
-                            self.poutput(f"Match found in field '{field}' (regex match):")
-                            self.poutput(json.dumps(record, indent=4, ensure_ascii=False))
-                            results_found = True
-                            break
-                    elif args.icontains:
-                        if search_value.lower() in str_field_val.lower():
-                            self.poutput(f"Match found in field '{field}' (case-insensitive contains match):")
-                            self.poutput(json.dumps(record, indent=4, ensure_ascii=False))
-                            results_found = True
-                            break
-                    elif args.contains:
-                        if search_value in str_field_val:
-                            self.poutput(f"Match found in field '{field}' (contains match):")
-                            self.poutput(json.dumps(record, indent=4, ensure_ascii=False))
-                            results_found = True
-                            break
-                    else:
-                        if use_json:
-                            if field_val == search_value:
-                                self.poutput(f"Match found in field '{field}' (exact JSON match):")
-                                self.poutput(json.dumps(record, indent=4, ensure_ascii=False))
-                                results_found = True
-                                break
-                        else:
-                            if str_field_val == args.value:
-                                self.poutput(f"Match found in field '{field}' (exact string match):")
-                                self.poutput(json.dumps(record, indent=4, ensure_ascii=False))
-                                results_found = True
-                                break
-            # Continue to next record after processing fields.
-        if not results_found:
+        # Compile the pattern once rather than on every record
+        pattern = None
+        if args.regex:
+            try:
+                pattern = re.compile(search_value)
+            except re.error as e:
+                self.perror(f"Invalid regular expression: {e}")
+                return
+        search_value_lower = search_value.lower() if args.icontains else None
+
+        if args.regex:
+            match_kind = "regex match"
+        elif args.icontains:
+            match_kind = "case-insensitive contains match"
+        elif args.contains:
+            match_kind = "contains match"
+        elif use_json:
+            match_kind = "exact JSON match"
+        else:
+            match_kind = "exact string match"
+
+        def is_match(field_val: Any, str_field_val: str) -> bool:
+            if args.regex:
+                return bool(pattern.search(str_field_val))
+            elif args.icontains:
+                return search_value_lower in str_field_val.lower()
+            elif args.contains:
+                return search_value in str_field_val
+            elif use_json:
+                return field_val == search_value
+            return str_field_val == args.value
+
+        # Record the first matching field of each record, using the cached string values
+        matched: Dict[int, Tuple[Dict[str, Any], str]] = {}  # doc_id -> (record, field)
+        for field in dict.fromkeys(args.field):  # Repeated --field options are only checked once
+            for doc_id, (record, field_val, str_field_val) in self.field_values(field).items():
+                if doc_id not in matched and is_match(field_val, str_field_val):
+                    matched[doc_id] = (record, field)
+
+        if matched:
+            # Render everything first and hand it to poutput in a single write
+            lines = []
+            for doc_id in sorted(matched):
+                record, field = matched[doc_id]
+                lines.append(f"Match found in field '{field}' ({match_kind}):")
+                lines.append(format_record(record))
+            self.poutput("\n".join(lines))
+        else:
             self.poutput("No matching records found.")
 
     # ---------------------------
@@ -334,6 +525,11 @@ class Console(BufferedCmd):
         default=80,
         help="Minimum fuzzy match score to consider a match (default: 80)"
     )
+    fuzzy_parser.add_argument(
+        "--all-fields",
+        action="store_true",
+        help="Report every matching field of a record, not only the first one in --field order"
+    )
     
     @cmd2.with_argparser(fuzzy_parser)
     @cmd2.with_category(CMD_CATEGORY)
@@ -341,34 +537,153 @@ class Console(BufferedCmd):
         """
         Perform a fuzzy search on records using the specified fields.
         For each record, each specified field is checked using fuzzy matching.
+        Like search, a record is reported once, for its first matching field, unless --all-fields is given.
         Matching records are sorted in descending order by score and then printed.
         
-        Usage: fuzzy_search <search_term> --field <field1> [--field <field2> ...] [--threshold <score>]
+        Usage: fuzzy_search <search_term> --field <field1> [--field <field2> ...] [--threshold <score>] [--all-fields]
         """
         if not self.ensure_db():
             return
 
         threshold = args.threshold
-        matches: List[Tuple[Dict[str, Any], str, Any, int]] = []  # (record, field, field_val, score)
-
-        for record in self.db.all():
-            for field in args.field:
-                field_val = get_nested_value(record, field)
-                if field_val is not None:
-                    score = fuzz.ratio(args.search_term, str(field_val))
-                    if score >= threshold:
-                        matches.append((record, field, field_val, score))
-                        # Continue checking other fields for potential better scores
+        fields = list(dict.fromkeys(args.field))  # Repeated --field options are only scored once
+        # (record, field, field_val, score, doc_id, field position)
+        matches: List[Tuple[Dict[str, Any], str, Any, int, int, int]] = []
+
+        # Fields with a Neofuzz index are answered by a nearest-neighbour lookup. The nearest values are
+        # re-scored with the same fuzz.ratio as unindexed fields, so --threshold means the same for both.
+        for pos, field in enumerate(fields):
+            if field not in self._neofuzz:
+                continue
+            neofuzz_process, doc_ids_by_value = self._neofuzz[field]
+            for str_val, _ in neofuzz_process.extract(args.search_term, limit=50):
+                score = round(fuzz.ratio(args.search_term, str_val))
+                if score < threshold:
+                    continue
+                for doc_id in doc_ids_by_value[str_val]:
+                    record, field_val, _ = self._strval_cache[field][doc_id]
+                    matches.append((record, field, field_val, score, doc_id, pos))
+
+        # Only score values that can still reach the threshold, in record order.
+        candidates: List[Tuple[int, int, str]] = []  # (doc_id, field position, field)
+        for pos, field in enumerate(fields):
+            if field in self._neofuzz:
+                continue
+            for doc_id in self.fuzzy_candidates(field, args.search_term, threshold):
+                candidates.append((doc_id, pos, field))
+        candidates.sort()
+
+        # meta[i] describes choices[i]
+        choices: List[str] = []
+        meta: List[Tuple[Dict[str, Any], str, Any, int, int]] = []  # (record, field, field_val, doc_id, field position)
+        for doc_id, pos, field in candidates:
+            record, field_val, str_val = self._strval_cache[field][doc_id]
+            choices.append(str_val)
+            meta.append((record, field, field_val, doc_id, pos))
+
+        # Scores are rounded before they are compared with the threshold, as thefuzz does;
+        # rapidfuzz only accepts cutoffs between 0 and 100
+        score_cutoff = min(max(threshold - 0.5, 0), 100)
+        if process is not None and np is not None:
+            # Score all candidates in one native call spread over every core (the GIL is released).
+            # The query is preprocessed once and scores below the cutoff come back as 0.
+            scores = process.cdist([args.search_term], choices, scorer=fuzz.ratio,
+                                   score_cutoff=score_cutoff, workers=-1)[0]
+            for idx in np.flatnonzero(np.round(scores) >= threshold):
+                record, field, field_val, doc_id, pos = meta[idx]
+                matches.append((record, field, field_val, round(float(scores[idx])), doc_id, pos))
+        elif process is not None:
+            # Score all candidates in one native call, pruning below the threshold.
+            # extract() preprocesses the query once (a cached Indel scorer) and reuses it
+            # for every candidate, so the per-comparison cost is only the candidate side.
+            scored = process.extract(args.search_term, choices, scorer=fuzz.ratio,
+                                     score_cutoff=score_cutoff, limit=None)
+            for _, score, idx in scored:
+                if round(score) < threshold:
+                    continue
+                record, field, field_val, doc_id, pos = meta[idx]
+                matches.append((record, field, field_val, round(score), doc_id, pos))
+        else:
+            for idx, choice in enumerate(choices):
+                score = fuzz.ratio(args.search_term, choice)
+                if score >= threshold:
+                    record, field, field_val, doc_id, pos = meta[idx]
+                    matches.append((record, field, field_val, score, doc_id, pos))
+
+        if not args.all_fields:
+            # Keep each record's first matching field in --field order, like search
+            first_pos: Dict[int, int] = {}
+            for match in matches:
+                first_pos[match[4]] = min(first_pos.get(match[4], match[5]), match[5])
+            matches = [match for match in matches if first_pos[match[4]] == match[5]]
 
         if matches:
             # Sort matches by score descending
             matches.sort(key=lambda x: x[3], reverse=True)
-            for record, field, field_val, score in matches:
-                self.poutput(f"Record match (field '{field}' with value '{field_val}', score: {score}):")
-                self.poutput(json.dumps(record, indent=4, ensure_ascii=False))
+            # Render everything first and hand it to poutput in a single write
+            lines = []
+            for record, field, field_val, score, _, _ in matches:
+                lines.append(f"Record match (field '{field}' with value '{field_val}', score: {score}):")
+                lines.append(format_record(record))
+            self.poutput("\n".join(lines))
         else:
             self.poutput("No fuzzy matching records found.")
 
+    fuzzy_index_parser = cmd2.Cmd2ArgumentParser()
+    fuzzy_index_parser.add_argument(
+        "--field",
+        action="append",
+        required=True,
+        help="Field(s) to index. Use dot notation for nested fields (e.g. int.hello)."
+    )
+
+    @cmd2.with_argparser(fuzzy_index_parser)
+    @cmd2.with_category(CMD_CATEGORY)
+    def do_fuzzy_index(self, args: Any) -> None:
+        """
+        Build a Neofuzz index (character n-gram TF-IDF vectors + nearest-neighbour search) for the given fields.
+        Subsequent fuzzy searches on these fields only score the 50 nearest values instead of every record,
+        trading some accuracy for speed on large databases. Those 50 are re-scored with fuzz.ratio, like other fields.
+        The index is dropped when the database changes.
+        Requires the optional neofuzz package.
+
+        Usage: fuzzy_index --field <field1> [--field <field2> ...]
+        """
+        if not self.ensure_db():
+            return
+        try:
+            # Optional, and slow to import (scikit-learn), so only loaded here
+            from neofuzz import Process as NeofuzzProcess
+            from sklearn.decomposition import TruncatedSVD
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            from sklearn.pipeline import make_pipeline
+        except ImportError:
+            self.perror("Neofuzz is not installed. Run 'pip install neofuzz' to use fuzzy_index.")
+            return
+
+        for field in args.field:
+            doc_ids_by_value: Dict[str, List[int]] = {}
+            for doc_id, (_, _, str_val) in self.field_values(field).items():
+                doc_ids_by_value.setdefault(str_val, []).append(doc_id)
+            if not doc_ids_by_value:
+                self.pwarning(f"No values found for field '{field}', nothing to index.")
+                continue
+
+            vectorizer = make_pipeline(
+                TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4)),
+                # The nearest-neighbour index needs dense vectors
+                TruncatedSVD(n_components=max(1, min(100, len(doc_ids_by_value) - 1))),
+            )
+            # Neofuzz's own refinement uses thefuzz's processed WRatio; fuzzy_search re-scores with fuzz.ratio instead
+            neofuzz_process = NeofuzzProcess(vectorizer)
+            try:
+                neofuzz_process.index(list(doc_ids_by_value))
+            except Exception as e:
+                self.perror(f"Error building fuzzy index for field '{field}': {e}")
+                continue
+            self._neofuzz[field] = (neofuzz_process, doc_ids_by_value)
+            self.poutput(f"Indexed {len(doc_ids_by_value)} distinct value(s) of field '{field}'.")
+
     @cmd2.with_category(CMD_CATEGORY)
     def do_open_json(self, args: Any) -> None:
         """
@@ -385,10 +700,27 @@ class Console(BufferedCmd):
             self.perror("Environment variable EDITOR is not set. Please set it to your preferred text editor.")
             return
 
+        # Write cached changes first, and re-read the file afterwards since it may have been edited
+        self.flush_db()
         try:
             subprocess.run([editor, self.file_path])
         except Exception as e:
             self.perror(f"Error opening JSON file: {e}")
+        self.close_db()
+        self.clear_indexes()
+
+    @cmd2.with_category(CMD_CATEGORY)
+    def do_flush(self, args: Any) -> None:
+        """
+        Write pending changes to the loaded JSON file.
+        Inserts are cached in memory and written when the CLI exits or on flush.
+
+        Usage: flush
+        """
+        if not self.ensure_db():
+            return
+        self.flush_db()
+        self.poutput(f"Changes written to {self.file_path}.")
 
     @cmd2.with_category(CMD_CATEGORY)
     def do_status(self, args: Any) -> None:
@@ -407,7 +739,8 @@ class Console(BufferedCmd):
             status_info.append("Database not loaded.")
         else:
             try:
-                record_count = len(self.db.all())
+                # len() counts the stored table without building a Document per record
+                record_count = len(self.db)
                 status_info.append(f"Database loaded with {record_count} record(s).")
             except Exception as e:
                 status_info.append(f"Error retrieving record count: {e}")
@@ -419,10 +752,11 @@ class Console(BufferedCmd):
             self.poutput(line)
 
 
-def main() -> None:
+def main(preloaded_data: Any = NO_DATA, file_path: Optional[str] = None) -> None:
     """
     Instantiate and run the Console CLI app.
-    Optionally load a JSON file at startup if the --json argument is provided.
+    Optionally load a JSON file at startup if the --json argument is provided,
+    or use preloaded_data, the already parsed contents of file_path.
     """
     import sys
     import argparse
@@ -444,7 +778,9 @@ def main() -> None:
     sys.argv = [sys.argv[0]]
 
     c = Console()
-    if args.json:
+    if preloaded_data is not NO_DATA:
+        c.load_json(file_path, data=preloaded_data)
+    elif args.json:
         c.load_json(args.json)
     sys.exit(c.cmdloop())
 
@@ -1,41 +1,97 @@
+import bisect
+import functools
+import itertools
 import json
 import os
+import re
 import subprocess
-from typing import Any, Dict, List, Optional, Union
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import cmd2
 from json_manager.buffered_cmd2 import BufferedCmd  # Or however you import it
-import requests  # For downloading JSON from a URL
-from thefuzz import fuzz  # For fuzzy matching score
-from dotenv import load_dotenv  # For loading environment variables from .env
 
-from json_manager.main import download_json
+from json_manager.json_io import (
+    HTTP_TIMEOUT, NO_DATA, compile_path, dumps, get_http_session, loads_utf8_replace, read_json_file
+)
+from json_manager.main import temp_json_path
+
+# requests, the fuzzy matching modules, numpy and python-dotenv are imported on first use
+# (see get_http_session, load_fuzzy_backend and load_env) to keep CLI start-up fast.
+fuzz = None
+process = None
+default_process = None
+np = None
 
 CMD_CATEGORY = "JSON Manager"
+FUZZY_SCORE_CACHE_SIZE = 32  # (search_term, field, scorer) score lists kept by fuzzy_search
+PARALLEL_MIN_CANDIDATES = 1024  # fewer candidates are scored on one thread, where thread start-up costs more
+FUZZY_SCORERS = ("ratio", "partial_ratio", "token_sort_ratio", "token_set_ratio", "WRatio")
+# Scorers that thefuzz runs on lowercased, alphanumeric-only strings; with rapidfuzz the
+# candidates are processed the same way once per field instead of on every call
+PROCESSED_SCORERS = ("token_sort_ratio", "token_set_ratio", "WRatio")
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # bytes written per chunk when streaming a download to disk
+SAVE_DELAY = 0.1  # seconds an insert waits before saving, so rapid inserts share one write
+JOIN_SEPARATOR = "\x00"  # joins a field's values for substring search; needles containing it are scanned per record
+APPEND_TAIL_SIZE = 4096  # bytes read from the end of a list file to find its closing bracket
+
+# A search --regex pattern without any of these characters matches exactly where it occurs as a substring
+_REGEX_META = re.compile(r"[\\.^$*+?{}\[\]|()]")
+
+
+def load_fuzzy_backend() -> None:
+    """
+    Import the fuzzy matching modules the first time fuzzy_search runs.
+    rapidfuzz is preferred, with thefuzz as the fallback; numpy is needed for process.cdist.
+    """
+    global fuzz, process, default_process, np
+    if fuzz is not None:
+        return
+    try:
+        from rapidfuzz import fuzz as _fuzz, process as _process  # C++ implementation of the thefuzz scorers
+        from rapidfuzz.utils import default_process as _default_process
+    except ImportError:
+        from thefuzz import fuzz as _fuzz  # For fuzzy matching score
+        _process = _default_process = None
+    try:
+        import numpy as _np  # Needed by rapidfuzz's process.cdist
+    except ImportError:
+        _np = None
+    process, default_process, np = _process, _default_process, _np
+    fuzz = _fuzz
+
+
+@functools.lru_cache(maxsize=1)
+def load_env() -> None:
+    """
+    Load environment variables from a .env file, once.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
 
+def stringify(field_val: Any) -> Optional[str]:
+    """
+    Return the text searches match a field value against: the value itself for strings, None for a missing value.
+    """
+    if field_val is None or type(field_val) is str:
+        return field_val
+    return str(field_val)
 
-def get_nested_value(record: Dict[str, Any], field_path: str) -> Optional[Any]:
+
+@functools.lru_cache(maxsize=256)
+def compile_regex(pattern: str) -> "re.Pattern[str]":
     """
-    Retrieve a nested value from a dictionary given a dot-separated field path.
-    For example, get_nested_value(record, "int.hello") returns record["int"]["hello"] if it exists.
+    Compile a search pattern, memoized so repeating a search skips compilation.
     """
-    parts = field_path.split(".")
-    current = record
-    for part in parts:
-        if not isinstance(current, dict):
-            return None
-        if part not in current:
-            return None
-        current = current[part]
-    return current
+    return re.compile(pattern)
 
 
 class Console(BufferedCmd):
     CMD_CATEGORY = CMD_CATEGORY
 
     def __init__(self, *args, **kwargs) -> None:
-        # Load environment variables from a .env file
-        load_dotenv()
         super().__init__(*args, **kwargs)
 
         self.prompt = "JSON CLI> "
@@ -45,9 +101,54 @@ class Console(BufferedCmd):
         self.settable_value: int = 12
         self.add_settable(cmd2.Settable("settable_value", str, "Settable value description", self))
 
+        # Save with the standard library's 4-space indentation instead of orjson's 2-space bytes output
+        self.pretty: bool = False
+        self.add_settable(cmd2.Settable("pretty", bool, "Save JSON with 4-space indentation (slower)", self))
+
         # self.data can be either a dict or a list (or None if nothing loaded)
         self.data: Optional[Union[Dict[str, Any], List[Any]]] = None
         self.file_path: Optional[str] = None
+        # True while self.data has changes that are not yet written to self.file_path
+        self._dirty: bool = False
+        # Deferred save started by insert; save_data may run on the timer thread
+        self._save_pending: bool = False
+        self._save_timer: Optional[threading.Timer] = None
+        # Held while self.data, _dirty and _append_start change and for the whole save, so the timer
+        # thread never writes a list that is growing under it
+        self._save_lock = threading.Lock()
+        # Errors from background saves, reported before the next command instead of into the prompt
+        self._save_errors: List[str] = []
+        self.register_precmd_hook(self.report_save_errors)
+        # Index of the first record not yet on disk while the only unsaved changes are inserts into a
+        # list; save_data then appends those records to the file instead of rewriting it
+        self._append_start: Optional[int] = None
+
+        # Search caches, all dropped by clear_caches.
+        # Field values per field, one per record (None where missing), built on first use.
+        # Searches scan these flat lists instead of walking every record's path again.
+        self._columns: Dict[str, List[Any]] = {}
+        # str() of those values per field (None where missing), shared by substring, regex and fuzzy searches
+        self._texts: Dict[str, List[Optional[str]]] = {}
+        # fuzzy_search scores per (search_term, field, scorer): (record indices, str(field value), scores,
+        # lowest threshold the scores are valid for). Cleared whenever the data changes.
+        self._fuzzy_scores: Dict[Tuple[str, str, str], Tuple[List[int], List[str], Any, int]] = {}
+        # fuzzy_search candidates per field, built on first use: (record indices, str(field value), lengths).
+        # Extended by insert and dropped on load.
+        self._fuzzy_candidates: Dict[str, Tuple[List[int], List[str], List[int]]] = {}
+        # Candidates run through rapidfuzz's default_process, per field, for PROCESSED_SCORERS
+        self._fuzzy_processed: Dict[str, List[str]] = {}
+        # Inverted index of the stringified values per field: text -> indices of the records holding it,
+        # so substring and regex searches test each distinct value once
+        self._distinct: Dict[str, Dict[str, List[int]]] = {}
+        # Those distinct values joined by JOIN_SEPARATOR, per field, with the offset each one starts at
+        # and the record indices of each value
+        self._joined: Dict[str, Tuple[str, List[int], List[List[int]]]] = {}
+        # The same for the lowercased values, for --icontains
+        self._joined_lower: Dict[str, Tuple[str, List[int], List[List[int]]]] = {}
+
+        # Exact-match index per field, built on first search: (value -> [(record index, value)],
+        # [(record index, value)] for unhashable values such as lists and dicts).
+        self._index: Dict[str, Tuple[Dict[Any, List[Tuple[int, Any]]], List[Tuple[int, Any]]]] = {}
 
     def ensure_data_loaded(self) -> bool:
         """
@@ -58,39 +159,166 @@ class Console(BufferedCmd):
             return False
         return True
 
-    def save_data(self) -> None:
+    def save_data(self, report: Optional[Callable[[str], None]] = None) -> None:
         """
         Write (sync) the in-memory data back to disk in JSON format.
-        Called at the end of every command to ensure changes are always persisted.
+        Only writes when the data changed since the last save, so read-only commands cost no I/O.
+        The data is written and fsynced to a sibling temp file that then replaces the original,
+        so an interrupted save or a crash never leaves a truncated file behind.
+        Errors go to report, perror by default.
         """
-        if self.file_path and self.data is not None:
+        report = report or self.perror
+        with self._save_lock:
+            if not self._dirty or not self.file_path or self.data is None:
+                return
+            # Cleared before writing, so changes made during the write mark the data dirty again
+            self._dirty = False
+            append_start, self._append_start = self._append_start, None
+            if append_start is not None and not self.pretty:
+                try:
+                    if self.append_to_file(self.data[append_start:]):
+                        return
+                except Exception as e:
+                    report(f"Error appending to {self.file_path}, rewriting it instead: {e}")
+            tmp_path = f"{self.file_path}.tmp"
             try:
-                with open(self.file_path, "w", encoding="utf-8", errors="replace") as f:
-                    json.dump(self.data, f, ensure_ascii=False, indent=4)
+                if self.pretty:
+                    with open(tmp_path, "w", encoding="utf-8", errors="replace", buffering=1 << 20) as f:
+                        json.dump(self.data, f, ensure_ascii=False, indent=4)
+                        f.flush()
+                        os.fsync(f.fileno())
+                else:
+                    # A payload larger than the buffer bypasses it and goes out in a single write call
+                    with open(tmp_path, "wb") as f:
+                        f.write(dumps(self.data, indent=True))
+                        os.fsync(f.fileno())
+                # The temp file is on disk before it takes the original's place
+                os.replace(tmp_path, self.file_path)
             except Exception as e:
-                self.perror(f"Error writing data to {self.file_path}: {e}")
+                self._dirty = True
+                report(f"Error writing data to {self.file_path}: {e}")
+
+    def append_to_file(self, records: List[Any]) -> bool:
+        """
+        Write records into the saved list in place: overwrite its closing bracket with the new
+        records and a new bracket, so an insert costs the size of the records, not of the file.
+        Returns False when the file does not end in a list, in which case nothing is written.
+        """
+        if not records or not os.path.isfile(self.file_path):
+            return False
+        chunks = [dumps(record) for record in records]
+
+        with open(self.file_path, "r+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            tail_start = max(0, size - APPEND_TAIL_SIZE)
+            f.seek(tail_start)
+            tail = f.read().rstrip()
+            if not tail.endswith(b"]"):
+                return False
+            before = tail[:-1].rstrip()
+            if not before:
+                # Only whitespace in the tail; leave anything unusual to a full rewrite
+                return False
+            separator = b"\n  " if before.endswith(b"[") else b",\n  "
+            # Overwrite from just after the last element (or the opening bracket)
+            f.seek(tail_start + len(before))
+            f.write(separator + b",\n  ".join(chunks) + b"\n]")
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+        return True
+
+    def schedule_save(self) -> None:
+        """
+        Save shortly in the background instead of blocking the command, unless a save is already pending.
+        Pending changes are written at the latest by flush or when the command loop ends.
+        """
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._save_timer = threading.Timer(SAVE_DELAY, self._deferred_save)
+        self._save_timer.daemon = True
+        self._save_timer.start()
 
-    def load_json(self, source: str) -> None:
+    def _deferred_save(self) -> None:
+        self._save_pending = False
+        # Runs on the timer thread, so errors wait for the next command rather than print into the prompt
+        self.save_data(report=self._save_errors.append)
+
+    def report_save_errors(self, data: cmd2.plugin.PrecommandData = None) -> cmd2.plugin.PrecommandData:
+        """
+        Print the errors of background saves since the last command. Also a precommand hook.
+        """
+        errors, self._save_errors = self._save_errors, []
+        for error in errors:
+            self.perror(error)
+        return data
+
+    def flush_data(self) -> None:
+        """
+        Cancel any pending background save and write pending changes now.
+        """
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_pending = False
+        self.save_data()
+        self.report_save_errors()
+
+    def postloop(self) -> None:
+        """
+        Write pending changes once the command loop (or a batch of executed commands) ends.
+        """
+        self.flush_data()
+        super().postloop()
+
+    def clear_caches(self, keep_per_record: bool = False) -> None:
+        """
+        Drop the search caches so they are rebuilt from the current data. With keep_per_record, the caches
+        holding one entry per record (columns, texts, distinct values, fuzzy candidates, exact index) are kept
+        for the caller to extend; the fuzzy scores and joined texts are dropped either way, since extending
+        them costs as much as rebuilding.
+        """
+        self._fuzzy_scores.clear()
+        self._joined.clear()
+        self._joined_lower.clear()
+        if keep_per_record:
+            return
+        self._columns.clear()
+        self._texts.clear()
+        self._fuzzy_candidates.clear()
+        self._fuzzy_processed.clear()
+        self._distinct.clear()
+        self._index.clear()
+
+    def load_json(self, source: str, data: Any = NO_DATA) -> None:
         """
         Load JSON data from a local file or a URL into self.data "as is".
           - If the data is a dict, we keep it as a dict.
           - If it's a list, we keep it as a list.
           - Otherwise, we error out.
 
+        If data is given, it is the already parsed contents of the local file `source`, which is not read again.
         The loaded data is synced to disk under 'self.file_path'.
         """
-        data: Union[List[Any], Dict[str, Any]] = []
         previous_file_path = self.file_path
+        # Write pending changes to the current file before switching away from it
+        self.flush_data()
 
+        # 0) Data already parsed by the caller
+        if data is not NO_DATA:
+            self.file_path = source
         # 1) Handle remote URLs
-        if source.startswith("http://") or source.startswith("https://"):
+        elif source.startswith("http://") or source.startswith("https://"):
             try:
-                response = requests.get(source)
-                response.raise_for_status()
-                data = response.json()
-                # We’ll store the downloaded data into "downloaded.json"
-                # self.file_path = "downloaded.json"
-                self.file_path = download_json(url=source)
+                # Stream the body straight to the temp file, then parse that file
+                file_path = temp_json_path(source)
+                with get_http_session().get(source, stream=True, timeout=HTTP_TIMEOUT) as response:
+                    response.raise_for_status()
+                    with open(file_path, "wb") as f:
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                data = read_json_file(file_path)
+                self.file_path = file_path
             except Exception as e:
                 self.perror(f"Error downloading JSON: {e}")
                 self.file_path = previous_file_path
@@ -99,8 +327,7 @@ class Console(BufferedCmd):
         else:
             self.file_path = source
             try:
-                with open(source, "r", encoding="utf-8", errors="replace") as f:
-                    data = json.load(f)
+                data = read_json_file(source)
             except Exception as e:
                 self.perror(f"Error reading JSON file: {e}")
                 self.file_path = previous_file_path
@@ -112,7 +339,11 @@ class Console(BufferedCmd):
             self.file_path = previous_file_path
             return
 
-        self.data = data
+        with self._save_lock:
+            self.data = data
+            self._dirty = True
+            self._append_start = None
+        self.clear_caches()
         self.poutput("JSON data loaded successfully.")
         self.save_data()  # Always sync after loading
 
@@ -127,44 +358,108 @@ class Console(BufferedCmd):
 
         Usage: load <source>
         """
+        # load_json writes the loaded data once; nothing is left to save here
         self.load_json(args.source.strip())
-        # self.save_data()  # Always sync
 
     insert_parser = cmd2.Cmd2ArgumentParser()
-    insert_parser.add_argument("record", help="JSON string representing the record to insert")
+    insert_parser.add_argument(
+        "record",
+        nargs="?",
+        help="JSON string representing the record to insert, or a JSON array of records"
+    )
+    insert_parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Insert every record of a newline-delimited JSON (NDJSON) file"
+    )
 
     @cmd2.with_argparser(insert_parser)
     @cmd2.with_category(CMD_CATEGORY)
     def do_insert(self, args: Any) -> None:
         """
-        Insert a new record (a dictionary) into the loaded JSON if it's a list.
+        Insert new records (dictionaries) into the loaded JSON if it's a list.
         If the loaded JSON is a dict, insertion is not permitted.
+        A JSON array or an NDJSON file inserts all of its records with a single save.
 
-        Usage: insert <json_record>
+        Usage: insert <json_record> | insert <json_array> | insert --batch <file.jsonl>
         Example: insert '{"name": "Alice", "age": 30}'
         """
         if not self.ensure_data_loaded():
-            self.save_data()
+            return
+        if (args.record is None) == (args.batch is None):
+            self.perror("Provide either a JSON record or --batch <file>.")
             return
 
         try:
-            record = json.loads(args.record)
-            if not isinstance(record, dict):
-                self.perror("Insert expects a JSON object (dictionary).")
-                self.save_data()
+            if args.batch is not None:
+                records = []
+                with open(args.batch, "rb") as f:
+                    for line_number, line in enumerate(f, start=1):
+                        if not line.strip():
+                            continue
+                        try:
+                            records.append(loads_utf8_replace(line))
+                        except ValueError:
+                            self.perror(f"Invalid JSON on line {line_number} of {args.batch}.")
+                            return
+            else:
+                record = loads_utf8_replace(args.record)
+                records = record if isinstance(record, list) else [record]
+
+            if not all(isinstance(record, dict) for record in records):
+                self.perror("Insert expects a JSON object (dictionary) or an array of objects.")
+                return
+            if not records:
+                # Nothing changes, so nothing is marked for saving either
+                self.perror("No records to insert.")
                 return
 
             if isinstance(self.data, list):
-                self.data.append(record)
-                self.poutput("Record inserted successfully.")
+                self.append_records(records)
+                if len(records) == 1:
+                    self.poutput("Record inserted successfully.")
+                else:
+                    self.poutput(f"{len(records)} records inserted successfully.")
             else:
                 self.perror("Current data is a dictionary (not a list). Cannot insert.")
         except json.JSONDecodeError:
             self.perror("Invalid JSON record provided.")
         except Exception as e:
             self.perror(f"Error inserting record: {e}")
-        finally:
-            self.save_data()  # Always sync after command
+
+    def append_records(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Append records to the loaded list, extend the search caches built so far, and schedule one save.
+        """
+        with self._save_lock:
+            start = len(self.data)
+            self.data.extend(records)
+            if not self._dirty:
+                # The file holds everything before start, so the save can append the rest
+                self._append_start = start
+            self._dirty = True
+        # The per-record caches are extended below; the rest is rebuilt on the next search
+        self.clear_caches(keep_per_record=True)
+        for field, column in self._columns.items():
+            column.extend(map(compile_path(field), records))
+        for field, texts in self._texts.items():
+            texts.extend(map(stringify, self._columns[field][start:]))
+        for field, distinct in self._distinct.items():
+            for idx, text in enumerate(self._texts[field][start:], start=start):
+                if text is not None:
+                    distinct.setdefault(text, []).append(idx)
+        for field, (indices, candidates, lengths) in self._fuzzy_candidates.items():
+            for idx, text in enumerate(self._texts[field][start:], start=start):
+                if text is not None:
+                    indices.append(idx)
+                    candidates.append(text)
+                    lengths.append(len(text))
+                    if field in self._fuzzy_processed:
+                        self._fuzzy_processed[field].append(default_process(candidates[-1]))
+        for field in self._index:
+            for idx, field_val in enumerate(self._columns[field][start:], start=start):
+                self.index_value(field, idx, field_val)
+        self.schedule_save()  # Sync shortly after the command
 
     # ---------------------------
     # SEARCH COMMAND (Exact Match)
@@ -207,7 +502,6 @@ class Console(BufferedCmd):
         Only prints "<field>: <value>" upon match, not the entire object.
         """
         if not self.ensure_data_loaded():
-            self.save_data()
             return
 
         # Decide how we interpret args.value
@@ -221,55 +515,140 @@ class Console(BufferedCmd):
             except json.JSONDecodeError:
                 search_value = args.value
 
-        def matches(field_val: Any) -> bool:
+        pattern = None
+        if args.regex:
+            try:
+                pattern = compile_regex(str(search_value))
+            except re.error as e:
+                self.perror(f"Invalid regular expression: {e}")
+                return
+
+        # Substring needle, prepared once instead of per record (a --regex pattern is never lowercased)
+        lowered = args.icontains and not args.regex
+        needle = str(search_value).lower() if lowered else str(search_value)
+
+        def matches(text: str) -> bool:
             """
-            Return True if field_val matches the user-provided 'search_value'
-            according to --contains, --icontains, --regex, or exact match.
+            Return True if the field value's text matches the user-provided 'search_value'
+            according to --contains, --icontains or --regex.
             """
             if args.regex:
                 # Regex match
-                return bool(re.search(str(search_value), str(field_val)))
+                return pattern.search(text) is not None
             elif args.icontains:
                 # Case-insensitive substring
-                return str(search_value).lower() in str(field_val).lower()
-            elif args.contains:
-                # Case-sensitive substring
-                return str(search_value) in str(field_val)
-            else:
-                # Exact match (which might be object-to-object if we parsed JSON)
-                return field_val == search_value
+                return needle in text.lower()
+            # Case-sensitive substring
+            return needle in text
 
         results_found = False
 
-        # Handle single-dict or list-of-dicts
-        if isinstance(self.data, dict):
-            record = self.data
+        if not (args.regex or args.contains or args.icontains):
+            # Exact match: look the value up in each field's index instead of scanning every record
+            matched: Dict[int, Tuple[str, Any]] = {}
+            for field in args.field:
+                for idx, field_val in self.exact_matches(field, search_value):
+                    # Keep the first matching field per record
+                    matched.setdefault(idx, (field, field_val))
+            for idx in sorted(matched):
+                field, field_val = matched[idx]
+                self.poutput(f"{field}: {field_val}")
+                results_found = True
+
+        # Handle single-dict or list-of-dicts, testing each field's distinct values instead of every record
+        else:
+            # A literal pattern needs no regex engine: it is found like a --contains needle
+            literal = args.regex and not _REGEX_META.search(needle)
+            # With several fields, a value that appears in more than one is tested once
+            tested: Dict[str, bool] = {}
+
+            def test(text: str) -> bool:
+                result = tested.get(text)
+                if result is None:
+                    result = tested[text] = matches(text)
+                return result
+
+            hits: List[set] = []
             for field in args.field:
-                field_val = get_nested_value(record, field)
-                if field_val is not None and matches(field_val):
-                    # Print only "<field>: <value>"
-                    self.poutput(f"{field}: {field_val}")
-                    results_found = True
-                    # Remove if you want to find more matches in other fields
-                    break
-
-        elif isinstance(self.data, list):
-            for idx, item in enumerate(self.data, start=1):
-                if not isinstance(item, dict):
-                    continue
-                for field in args.field:
-                    field_val = get_nested_value(item, field)
-                    if field_val is not None and matches(field_val):
-                        self.poutput(f"{field}: {field_val}")
-                        results_found = True
-                        # Remove if you want to find more matches in other fields
-                        break
+                # --regex takes precedence over --contains and --icontains, as in the per-value test
+                substring = literal or (not args.regex and (args.contains or args.icontains))
+                if substring and needle and JOIN_SEPARATOR not in needle:
+                    # Substring: find the needle in the field's joined (and for --icontains, lowercased) values
+                    hits.append(set(self.substring_matches(field, needle, lowered=lowered)))
+                else:
+                    hits.append({
+                        idx
+                        for text, indices in self.distinct_values(field).items()
+                        if (test(text) if len(args.field) > 1 else matches(text))
+                        for idx in indices
+                    })
+            for idx in sorted(set().union(*hits)):
+                # Keep the first matching field per record
+                pos = next(pos for pos, field_hits in enumerate(hits) if idx in field_hits)
+                field = args.field[pos]
+                # Print only "<field>: <value>"
+                self.poutput(f"{field}: {self.text_column(field)[idx]}")
+                results_found = True
 
         if not results_found:
             self.poutput("No matching records found.")
 
-        # Always sync after command
-        self.save_data()
+    def column(self, field: str) -> List[Any]:
+        """
+        Return the field's value for every record, in record order (None where the record lacks it).
+        Built in one pass on first use, extended by insert, and dropped on load.
+        """
+        column = self._columns.get(field)
+        if column is None:
+            # A single dictionary is treated like a list holding one record
+            records = [self.data] if isinstance(self.data, dict) else self.data
+            # The accessor returns None for records that are not dicts as well
+            column = list(map(compile_path(field), records))
+            self._columns[field] = column
+        return column
+
+    def text_column(self, field: str) -> List[Optional[str]]:
+        """
+        Return str() of the field's value for every record, in record order (None where the record lacks it).
+        Built once per field so repeated searches do not stringify the same values again.
+        """
+        texts = self._texts.get(field)
+        if texts is None:
+            texts = list(map(stringify, self.column(field)))
+            self._texts[field] = texts
+        return texts
+
+    def index_value(self, field: str, idx: int, field_val: Any) -> None:
+        """
+        Add one record's field value to the exact-match index of that field.
+        """
+        if field_val is None:
+            return
+        by_value, unhashable = self._index[field]
+        try:
+            by_value.setdefault(field_val, []).append((idx, field_val))
+        except TypeError:
+            unhashable.append((idx, field_val))
+
+    def exact_matches(self, field: str, search_value: Any) -> List[Tuple[int, Any]]:
+        """
+        Return (record index, field value) pairs whose field value equals search_value.
+        The field's index is built in one pass on first use and kept until the data is reloaded.
+        """
+        if field not in self._index:
+            self._index[field] = ({}, [])
+            for idx, field_val in enumerate(self.column(field)):
+                self.index_value(field, idx, field_val)
+
+        by_value, unhashable = self._index[field]
+        matches: List[Tuple[int, Any]] = []
+        try:
+            matches.extend(by_value.get(search_value, ()))
+        except TypeError:
+            # An unhashable search value (list or dict) can only equal an unhashable field value
+            pass
+        matches.extend((idx, field_val) for idx, field_val in unhashable if field_val == search_value)
+        return matches
 
     # ---------------------------
     # FUZZY SEARCH COMMAND
@@ -288,6 +667,17 @@ class Console(BufferedCmd):
         default=80,
         help="Minimum fuzzy match score to consider a match (default: 80)"
     )
+    fuzzy_parser.add_argument(
+        "--scorer",
+        choices=FUZZY_SCORERS,
+        default="WRatio",
+        help="Fuzzy scorer to rank matches with (default: WRatio)"
+    )
+    fuzzy_parser.add_argument(
+        "--all-fields",
+        action="store_true",
+        help="Report every matching field of a record, not only the first one in --field order"
+    )
 
     @cmd2.with_argparser(fuzzy_parser)
     @cmd2.with_category(CMD_CATEGORY)
@@ -295,75 +685,266 @@ class Console(BufferedCmd):
         """
         Perform a fuzzy search on records (dicts) using the specified field(s).
         If a match is found, only print "<field>: <value>", rather than the entire object.
+        Like search, a record is reported for its first matching field only, and later fields are not
+        scored for records that already matched, unless --all-fields is given.
         Results are sorted by score (descending).
         """
-        from thefuzz import fuzz
-
         if not self.ensure_data_loaded():
-            self.save_data()
             return
+        load_fuzzy_backend()
 
         threshold = args.threshold
-        results = []  # store (score, field, field_val)
-
-        if isinstance(self.data, dict):
-            # Single dictionary
-            record = self.data
-            for field in args.field:
-                field_val = get_nested_value(record, field)
-                if field_val is not None:
-                    score = fuzz.ratio(args.search_term, str(field_val))
-                    if score >= threshold:
-                        results.append((score, field, field_val))
-
-        elif isinstance(self.data, list):
-            # A list of items
-            for idx, item in enumerate(self.data, start=1):
-                if not isinstance(item, dict):
-                    continue
-                for field in args.field:
-                    field_val = get_nested_value(item, field)
-                    if field_val is not None:
-                        score = fuzz.ratio(args.search_term, str(field_val))
-                        if score >= threshold:
-                            results.append((score, field, field_val))
-
-        # Sort results by score descending
-        results.sort(key=lambda x: x[0], reverse=True)
+        # Scores are rounded before they are compared with the threshold, as thefuzz does. fuzz.ratio drops
+        # at least 100 / (len(a) + len(b)) points per edit, so below a combined length of 200 only identical
+        # strings round to 100 and that case is a plain comparison
+        exact = threshold == 100 and args.scorer == "ratio" and process is not None
+        query_len = len(args.search_term)
+        results = []  # store (score, record index, field position, field, str(field_val))
+        # Records already matched on an earlier field; left empty with --all-fields
+        matched: set = set()
+        for pos, field in enumerate(args.field):
+            if exact:
+                indices, candidates, lengths = self.fuzzy_candidates(field)
+                for i, candidate in enumerate(candidates):
+                    if indices[i] in matched:
+                        continue
+                    if candidate == args.search_term or (
+                        lengths[i] + query_len >= 200 and round(fuzz.ratio(args.search_term, candidate)) >= 100
+                    ):
+                        results.append((100, indices[i], pos, field, candidate))
+            else:
+                indices, candidates, scores = self.fuzzy_scores(
+                    args.search_term, field, threshold, args.scorer, skip=matched
+                )
+                if np is not None:
+                    hits = np.flatnonzero(np.round(scores) >= threshold)
+                else:
+                    hits = [i for i, score in enumerate(scores) if round(score) >= threshold]
+                for i in hits:
+                    if indices[i] not in matched:
+                        results.append((round(float(scores[i])), indices[i], pos, field, candidates[i]))
+            if not args.all_fields:
+                matched.update(result[1] for result in results)
+
+        # Sort results by score descending, keeping record order among equal scores
+        results.sort(key=lambda x: (-x[0], x[1], x[2]))
 
         if not results:
             self.poutput("No fuzzy matching records found.")
         else:
-            for score, field, field_val in results:
-                # Print "field: value" only
-                self.poutput(f"{field}: {field_val}")
+            # Print "field: value" only, reusing the string the value was scored as, in one write
+            self.poutput("\n".join(f"{field}: {text}" for _, _, _, field, text in results))
 
-        self.save_data()  # Always sync
+    def fuzzy_scores(
+        self, search_term: str, field: str, threshold: int, scorer_name: str = "WRatio",
+        skip: Optional[set] = None
+    ) -> Tuple[List[int], List[str], Any]:
+        """
+        Return (record indices, stringified field values, scores) for every record that has the field,
+        scored with the named fuzz scorer.
+
+        fuzz.ratio can never exceed 200 * min(len(a), len(b)) / (len(a) + len(b)), so for that scorer
+        candidates whose length alone keeps them below the threshold are not scored and are left at 0.
+        rapidfuzz is given half a point below the threshold as score_cutoff (scores are rounded before they are
+        compared), which lets it stop scoring a candidate as soon as it cannot reach it; those scores are 0 as well.
+        Scores are cached per (search_term, field, scorer) until the data changes, so repeating a search
+        with an equal or higher threshold or another combination of fields only scores what has not been seen yet.
+        Records whose index is in skip (already matched on another field) are not scored either and are left at 0;
+        unless the scores are already cached, such partial scores are returned without being cached.
+        """
+        key = (search_term, field, scorer_name)
+        cached = self._fuzzy_scores.get(key)
+        if cached is not None and cached[3] <= threshold:
+            return cached[:3]
+        load_fuzzy_backend()
+
+        scorer = getattr(fuzz, scorer_name)
+        indices, candidates, lengths = self.fuzzy_candidates(field)
+        query, choices = search_term, candidates
+        if process is not None and scorer_name in PROCESSED_SCORERS:
+            query, choices = default_process(search_term), self.fuzzy_processed(field)
+
+        query_len = len(search_term)
+        # rapidfuzz only accepts cutoffs between 0 and 100
+        score_cutoff = min(max(threshold - 0.5, 0), 100)
+        if np is not None:
+            if scorer_name == "ratio":
+                # Half a point of slack for the upper bound, since thefuzz rounds its scores
+                totals = np.asarray(lengths) + query_len
+                keep = np.flatnonzero(400 * np.minimum(totals - query_len, query_len) + totals >= 2 * threshold * totals)
+            else:
+                keep = np.arange(len(choices))
+            if skip:
+                keep = keep[np.fromiter((indices[i] not in skip for i in keep), dtype=bool, count=len(keep))]
+            scores = np.zeros(len(choices))
+            if process is not None and len(keep):
+                kept = choices if len(keep) == len(choices) else [choices[i] for i in keep]
+                # Score the remaining candidates in one native call; large lists are spread over every core
+                # (the GIL is released)
+                workers = -1 if len(kept) > PARALLEL_MIN_CANDIDATES else 1
+                scores[keep] = process.cdist(
+                    [query], kept, scorer=scorer, score_cutoff=score_cutoff, workers=workers
+                )[0]
+            else:
+                for i in keep:
+                    scores[i] = scorer(query, choices[i])
+        else:
+            # thefuzz's scorers take no cutoff
+            cutoff = {"score_cutoff": score_cutoff} if process is not None else {}
+            scores = [
+                scorer(query, choice, **cutoff)
+                if (not skip or idx not in skip)
+                and (
+                    scorer_name != "ratio"
+                    or 400 * min(length, query_len) + length + query_len >= 2 * threshold * (length + query_len)
+                )
+                else 0
+                for idx, choice, length in zip(indices, choices, lengths)
+            ]
+
+        if skip:
+            return indices, candidates, scores
+        self._fuzzy_scores.pop(key, None)
+        if len(self._fuzzy_scores) >= FUZZY_SCORE_CACHE_SIZE:
+            # Evict the oldest entry
+            del self._fuzzy_scores[next(iter(self._fuzzy_scores))]
+        self._fuzzy_scores[key] = (indices, candidates, scores, threshold)
+        return indices, candidates, scores
+
+    def fuzzy_candidates(self, field: str) -> Tuple[List[int], List[str], List[int]]:
+        """
+        Return (record indices, stringified field values, their lengths) for every record that has the field.
+        Built once per field and reused by every search term until the data is reloaded.
+        """
+        cached = self._fuzzy_candidates.get(field)
+        if cached is not None:
+            return cached
+
+        texts = self.text_column(field)
+        indices = [idx for idx, text in enumerate(texts) if text is not None]
+        candidates = [texts[idx] for idx in indices]
+        lengths = [len(candidate) for candidate in candidates]
+        self._fuzzy_candidates[field] = (indices, candidates, lengths)
+        return indices, candidates, lengths
+
+    def substring_matches(self, field: str, needle: str, lowered: bool = False) -> List[int]:
+        """
+        Return the indices of records whose stringified field value (lowercased if lowered) contains needle,
+        which must not contain JOIN_SEPARATOR. The field's values are joined into one string once,
+        so a search is a str.find per hit instead of a Python-level test per record.
+        """
+        joined, starts, records = self.joined_text(field, lowered)
+        hits: List[int] = []
+        pos = joined.find(needle)
+        while pos != -1:
+            i = bisect.bisect_right(starts, pos) - 1
+            hits.extend(records[i])
+            if i + 1 == len(starts):
+                break
+            # Continue with the next value; one hit per value is enough
+            pos = joined.find(needle, starts[i + 1])
+        return hits
+
+    def joined_text(self, field: str, lowered: bool = False) -> Tuple[str, List[int], List[List[int]]]:
+        """
+        Return the field's distinct values (lowercased if lowered) joined by JOIN_SEPARATOR,
+        the offset each value starts at and the indices of the records holding each value.
+        Built on first substring search and dropped whenever the data changes.
+        """
+        joined = self._joined_lower if lowered else self._joined
+        cached = joined.get(field)
+        if cached is None:
+            distinct = self.distinct_values(field)
+            # Lowercasing can change a value's length, so offsets are taken from the lowercased texts
+            texts = [text.lower() for text in distinct] if lowered else list(distinct)
+            starts = list(itertools.accumulate((len(text) + 1 for text in texts[:-1]), initial=0))
+            cached = (JOIN_SEPARATOR.join(texts), starts if texts else [], list(distinct.values()))
+            joined[field] = cached
+        return cached
+
+    def distinct_values(self, field: str) -> Dict[str, List[int]]:
+        """
+        Return the field's inverted index: each distinct stringified value, in order of first appearance,
+        with the indices of the records holding it. Built once per field, extended by insert and dropped on load.
+        """
+        distinct = self._distinct.get(field)
+        if distinct is None:
+            distinct = {}
+            for idx, text in enumerate(self.text_column(field)):
+                if text is not None:
+                    distinct.setdefault(text, []).append(idx)
+            self._distinct[field] = distinct
+        return distinct
+
+    def fuzzy_processed(self, field: str) -> List[str]:
+        """
+        Return the field's candidates run through rapidfuzz's default_process, built once per field.
+        """
+        processed = self._fuzzy_processed.get(field)
+        if processed is None:
+            _, candidates, _ = self.fuzzy_candidates(field)
+            processed = [default_process(candidate) for candidate in candidates]
+            self._fuzzy_processed[field] = processed
+        return processed
 
+    @cmd2.with_category(CMD_CATEGORY)
+    def do_flush(self, args: Any) -> None:
+        """
+        Write pending changes to the loaded JSON file.
+        Inserts are saved shortly in the background, when the CLI exits, or on flush.
+
+        Usage: flush
+        """
+        if not self.ensure_data_loaded():
+            return
+        self.flush_data()
+        self.poutput(f"Changes written to {self.file_path}.")
+
+    open_json_parser = cmd2.Cmd2ArgumentParser()
+    open_json_parser.add_argument(
+        "--background",
+        action="store_true",
+        help="Start the editor in the background instead of waiting for it (for editors with their own window)"
+    )
+
+    @cmd2.with_argparser(open_json_parser)
     @cmd2.with_category(CMD_CATEGORY)
     def do_open_json(self, args: Any) -> None:
         """
         Open the currently loaded JSON file using the default editor specified in the EDITOR environment variable.
+        Waits for the editor to exit and then reloads the file, so later saves keep the edits.
+        With --background the CLI stays usable, but the edits are only picked up by loading the file again.
 
-        Usage: open_json
+        Usage: open_json [--background]
         """
         if not self.file_path or not os.path.exists(self.file_path):
             self.perror("No JSON file loaded. Please load a JSON file first.")
-            self.save_data()
             return
 
+        # EDITOR may come from a .env file
+        load_env()
         editor = os.getenv("EDITOR")
         if not editor:
             self.perror("Environment variable EDITOR is not set. Please set it to your preferred text editor.")
-            self.save_data()
             return
 
+        # Let the editor see inserts that are still waiting to be saved
+        self.flush_data()
         try:
+            if args.background:
+                subprocess.Popen([editor, self.file_path], close_fds=True)
+                self.pwarning(
+                    f"Run 'load {self.file_path}' after saving in the editor; "
+                    "inserting before then overwrites the edits."
+                )
+                return
             subprocess.run([editor, self.file_path])
         except Exception as e:
             self.perror(f"Error opening JSON file: {e}")
+            return
 
-        self.save_data()  # Always sync
+        # Re-read the file since it may have been edited
+        self.load_json(self.file_path)
 
     @cmd2.with_category(CMD_CATEGORY)
     def do_status(self, args: Any) -> None:
@@ -392,12 +973,11 @@ class Console(BufferedCmd):
         for line in status_info:
             self.poutput(line)
 
-        self.save_data()  # Always sync
-
-def main() -> None:
+def main(preloaded_data: Any = NO_DATA, file_path: Optional[str] = None) -> None:
     """
     Instantiate and run the Console CLI app.
-    Optionally load a JSON file at startup if the --json argument is provided.
+    Optionally load a JSON file at startup if the --json argument is provided,
+    or use preloaded_data, the already parsed contents of file_path.
     """
     import sys
     import argparse
@@ -419,9 +999,10 @@ def main() -> None:
     sys.argv = [sys.argv[0]]
 
     c = Console()
-    if args.json:
+    if preloaded_data is not NO_DATA:
+        c.load_json(file_path, data=preloaded_data)
+    elif args.json:
         c.load_json(args.json)
-        c.save_data()
     c.cmdloop()
 
 
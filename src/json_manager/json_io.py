@@ -0,0 +1,156 @@
+import functools
+import json
+import mmap
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Union
+
+try:
+    import orjson  # Faster JSON parsing/serialization
+except ImportError:
+    orjson = None
+try:
+    import ijson  # Incremental parsing of large files
+except ImportError:
+    ijson = None
+
+HTTP_TIMEOUT = 30  # seconds
+MMAP_MIN_SIZE = 1 << 20  # files at least this large are parsed from a memory map
+STREAM_MIN_SIZE = 64 << 20  # files at least this large are parsed incrementally with ijson when orjson cannot
+
+# orjson silently reads integers beyond 64 bits as floats, so input with a run of 19 or more digits
+# is left to the standard library parser (digits inside strings only cost the faster path)
+_LONG_DIGITS = re.compile(rb"\d{19,}")
+_LONG_DIGITS_STR = re.compile(r"\d{19,}")
+
+# Default of the consoles' preloaded data arguments: nothing was parsed by the caller.
+# None cannot mark that, since a file holding JSON null parses to None.
+NO_DATA: Any = object()
+
+
+
+class NonFiniteFloat(float):
+    """
+    A NaN or Infinity literal read by the stdlib parser. orjson would write it as null, but it refuses
+    float subclasses, so saves holding one fall back to the standard library, which writes the literal back.
+    """
+
+
+def _parse_constant(name: str) -> NonFiniteFloat:
+    return NonFiniteFloat(name)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_path(field_path: str) -> Callable[[Any], Optional[Any]]:
+    """
+    Generate a function that reads one dot-separated field path from a record, so the path is
+    handled once per field instead of once per record. For example, compile_path("int.hello") compiles to:
+      def access(record):
+          try:
+              return record["int"]["hello"]
+          except (KeyError, TypeError):
+              return None
+    The subscripts are straight-line bytecode, so there is no per-level loop or type check.
+    """
+    subscripts = "".join(f"[{part!r}]" for part in field_path.split("."))
+    source = (
+        "def access(record):\n"
+        "    try:\n"
+        f"        return record{subscripts}\n"
+        "    except (KeyError, TypeError):\n"
+        "        return None\n"
+    )
+    namespace: Dict[str, Any] = {}
+    exec(source, namespace)
+    return namespace["access"]
+
+
+@functools.lru_cache(maxsize=1)
+def get_http_session() -> Any:
+    """
+    Return the requests Session shared by every Console in the process, created on first use.
+    Its connections are pooled and kept alive, with retries on transient errors,
+    so repeated loads from the same host reuse the TCP/TLS connection.
+    """
+    import requests  # For downloading JSON from a URL
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=3, backoff_factor=0.3))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def loads_utf8_replace(raw: Union[bytes, str]) -> Any:
+    """
+    Parse JSON bytes or text, with orjson when available. Input orjson rejects (such as bad encodings
+    or NaN literals) or would misread (integers beyond 64 bits) falls back to the stdlib parser
+    with invalid UTF-8 replaced.
+    """
+    long_digits = _LONG_DIGITS_STR if isinstance(raw, str) else _LONG_DIGITS
+    if orjson is not None and not long_digits.search(raw):
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    if isinstance(raw, str):
+        return json.loads(raw, parse_constant=_parse_constant)
+    return json.loads(raw.decode("utf-8", errors="replace"), parse_constant=_parse_constant)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes, with orjson when it can write every value (indented by 2 spaces).
+    orjson refuses integers beyond 64 bits and NonFiniteFloat, so those go to the stdlib encoder
+    (indented by 4 spaces), which writes them back as read.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, option=option)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=4 if indent else None).encode("utf-8", errors="replace")
+
+
+def stream_json_file(f: Any) -> Optional[Union[List[Any], Dict[str, Any]]]:
+    """
+    Build a top-level list or dict one element at a time with ijson, so the whole text is never held
+    in memory next to the parsed data. Returns None for other top-level values or invalid input.
+    """
+    head = f.read(64).lstrip()
+    f.seek(0)
+    try:
+        if head.startswith(b"["):
+            return list(ijson.items(f, "item", use_float=True))
+        if head.startswith(b"{"):
+            return dict(ijson.kvitems(f, "", use_float=True))
+    except Exception:
+        f.seek(0)
+    return None
+
+
+def read_json_file(path: str) -> Any:
+    """
+    Parse a JSON file. With orjson, large files are parsed straight from a read-only memory map
+    instead of being copied into a bytes object first. Very large files orjson cannot parse
+    (or any, without orjson) are streamed with ijson when it is installed.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if orjson is not None and size >= MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    if not _LONG_DIGITS.search(view):
+                        try:
+                            return orjson.loads(view)
+                        except orjson.JSONDecodeError:
+                            pass
+            f.seek(0)
+        if ijson is not None and size >= STREAM_MIN_SIZE:
+            data = stream_json_file(f)
+            if data is not None:
+                return data
+        return loads_utf8_replace(f.read())
@@ -2,15 +2,16 @@
 import argparse
 import os
 import sys
-import json
+import shutil
 from urllib.parse import urlparse
-import requests
+
+from json_manager.json_io import HTTP_TIMEOUT, read_json_file
 
 TEMP_DIR = "temp/"
 
-def download_json(url: str, temp_dir: str=TEMP_DIR) -> str:
+def temp_json_path(url: str, temp_dir: str=TEMP_DIR) -> str:
     """
-    Download JSON from a URL into the temporary directory.
+    Return the path in the temporary directory where JSON from a URL is saved.
     Uses the last part of the URL path as the filename,
     appending ".json" if not already present.
     """
@@ -19,13 +20,23 @@ def download_json(url: str, temp_dir: str=TEMP_DIR) -> str:
     filename = os.path.basename(parsed.path)
     if not filename.endswith(".json"):
         filename += ".json"
-    file_path = os.path.join(temp_dir, filename)
+    return os.path.join(temp_dir, filename)
+
+def download_json(url: str, temp_dir: str=TEMP_DIR) -> str:
+    """
+    Download JSON from a URL into the temporary directory (see temp_json_path).
+    The body is streamed to disk as received; it is parsed once, by the caller.
+    """
+    import requests  # Imported here so starting the CLI does not pay for it
+
+    file_path = temp_json_path(url, temp_dir)
     print(f"Downloading JSON from {url} to {file_path}...")
-    response = requests.get(url)
-    response.raise_for_status()
-    data = response.json()
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    with requests.get(url, stream=True, timeout=HTTP_TIMEOUT) as response:
+        response.raise_for_status()
+        # Undo any gzip/deflate transfer encoding while copying
+        response.raw.decode_content = True
+        with open(file_path, "wb") as f:
+            shutil.copyfileobj(response.raw, f)
     return file_path
 
 def is_tinydb_format(data: any) -> bool:
@@ -54,8 +65,8 @@ def main():
 
     # Load the JSON file to inspect its structure.
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # The same parser the consoles use, so the data handed to them below reads exactly as they would read it
+        data = read_json_file(file_path)
     except Exception as e:
         print(f"Error reading JSON file: {e}")
         sys.exit(1)
@@ -63,15 +74,13 @@ def main():
     # If the JSON is TinyDB-compatible (has '_default') or is a list, use db_console.
     if is_tinydb_format(data) or isinstance(data, list):
         print("Launching db_console...")
-        # Pass the file as an argument to db_console by resetting sys.argv
-        sys.argv = [sys.argv[0], "--json", file_path]
+        # Hand over the parsed data so the console does not read the file again
         from json_manager import db_console
-        db_console.main()
+        db_console.main(preloaded_data=data, file_path=file_path)
     else:
         print("Launching json_console...")
-        sys.argv = [sys.argv[0], "--json", file_path]
         from json_manager import json_console
-        json_console.main()
+        json_console.main(preloaded_data=data, file_path=file_path)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,103 @@
+import json
+import random
+import re
+import sys
+
+import pytest
+from rapidfuzz import fuzz
+
+from json_manager import db_console
+from json_manager.db_console import Console
+
+QUERIES = ["abcdeabcdeabcdeabcdeabcdeab", "abcab", "aaaaabbbbbccccc", "e"]
+THRESHOLDS = [0, 50, 70, 80, 87, 95, 100]
+
+
+@pytest.fixture
+def words():
+    rng = random.Random(5)
+    words = ["".join(rng.choice("abcde") for _ in range(rng.randint(1, 30))) for _ in range(500)]
+    # Prefixes of the first query padded with noise land on both sides of every threshold
+    words += [QUERIES[0][:n] + "Z" * k for n in range(5, 27) for k in range(12)]
+    # Words sharing no trigram with the queries, for the q-gram filter to drop
+    words += ["".join(rng.choice("vwxyz") for _ in range(rng.randint(20, 30))) for _ in range(100)]
+    return words
+
+
+@pytest.fixture
+def console(tmp_path, monkeypatch, words):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data.json").write_text(json.dumps([{"n": word} for word in words]))
+    console = Console()
+    console.execute_command("load data.json")
+    return console
+
+
+def test_fuzzy_candidates_keep_every_match(console, words):
+    doc_ids = {word: [] for word in words}
+    for doc_id, record in console.db.storage.read()["_default"].items():
+        doc_ids[record["n"]].append(int(doc_id))
+    for query in QUERIES:
+        for threshold in THRESHOLDS:
+            candidates = set(console.fuzzy_candidates("n", query, threshold))
+            if threshold >= 80:
+                assert len(candidates) < len(words)
+            for word in words:
+                if round(fuzz.ratio(query, word)) >= threshold:
+                    assert set(doc_ids[word]) <= candidates, (query, threshold, word)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_fuzzy_search_agrees_with_brute_force(console, words, monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(db_console, "np", None)
+    for query in QUERIES:
+        for threshold in THRESHOLDS:
+            out = console.execute_command(f"fuzzy_search {query} --field n --threshold {threshold}").output["output"]
+            got = sorted(re.findall(r"value '([^']*)', score: (\d+)", out[-1]))
+            expected = sorted(
+                (word, str(round(fuzz.ratio(query, word)))) for word in words
+                if round(fuzz.ratio(query, word)) >= threshold
+            )
+            assert got == expected, (query, threshold)
+
+
+def test_conversion_keeps_big_integers_and_non_finite_floats(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data.json").write_text('[{"n": 123456789012345678901234, "v": NaN}]')
+    console = Console()
+    console.execute_command("load data.json")
+    console.execute_command("insert '{\"w\": Infinity}'")
+    console.execute_command("flush")
+    written = (tmp_path / "data.db.json").read_text()
+    assert "123456789012345678901234" in written
+    assert "NaN" in written and "Infinity" in written
+    out = console.execute_command("search 123456789012345678901234 --field n").output["output"]
+    assert "123456789012345678901234" in out[-1]
+
+
+def test_fuzzy_candidates_allow_for_rounding(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    query = "abcdefghijklmnopqrstuvwxyz"
+    # 86.96 by length alone, and 81.82 with no trigram in common with the query
+    prefix = query[:20]
+    gapped = "".join(char for i, char in enumerate(query) if i % 3 != 2)
+    (tmp_path / "data.json").write_text(json.dumps([{"n": prefix}, {"n": gapped}, {"n": "zzz"}]))
+    console = Console()
+    console.execute_command("load data.json")
+    assert set(console.fuzzy_candidates("n", query, 87)) >= {1}
+    assert set(console.fuzzy_candidates("n", query, 82)) >= {1, 2}
+    out = console.execute_command(f"fuzzy_search {query} --field n --threshold 82").output["output"]
+    assert re.findall(r"score: (\d+)", out[-1]) == ["87", "82"]
+
+
+def test_neofuzz_is_imported_by_fuzzy_index_only(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert "neofuzz" not in vars(db_console) and "sklearn" not in vars(db_console)
+    # Simulate a missing neofuzz even where it is installed
+    monkeypatch.setitem(sys.modules, "neofuzz", None)
+    (tmp_path / "data.json").write_text('[{"n": "alice"}]')
+    console = Console()
+    console.execute_command("load data.json")
+    errors = console.execute_command("fuzzy_index --field n").output["error"]
+    assert errors == ["Neofuzz is not installed. Run 'pip install neofuzz' to use fuzzy_index."]
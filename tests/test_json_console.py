@@ -0,0 +1,232 @@
+import json
+import random
+import sys
+
+import pytest
+from rapidfuzz import fuzz
+
+from json_manager import json_console, main
+from json_manager.json_console import Console
+
+
+@pytest.fixture
+def console(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return Console()
+
+
+def load(console, tmp_path, text, name="data.json"):
+    path = tmp_path / name
+    path.write_text(text)
+    console.execute_command(f"load {name}")
+    return path
+
+
+def output(console, command):
+    return console.execute_command(command).output["output"]
+
+
+@pytest.mark.parametrize("text", ["[]", '[{"x": 1}]', '[\n    {\n        "x": 1\n    }\n]\n', '[{"x": 1}]  \n\n'])
+def test_append_to_file_rewrites_the_closing_bracket(console, tmp_path, text):
+    path = tmp_path / "data.json"
+    path.write_text(text)
+    console.data = json.loads(text)
+    console.file_path = str(path)
+    head = text.rstrip()[:-1].rstrip()
+
+    records = [{"y": 2}, {"z": "é", "n": 123456789012345678901234}]
+    assert console.append_to_file(records)
+    written = path.read_text(encoding="utf-8")
+    # Everything before the closing bracket stays in place
+    assert written.startswith(head)
+    assert json.loads(written) == json.loads(text) + records
+
+
+def test_append_to_file_leaves_a_dict_alone(console, tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('{"k": 1}')
+    console.file_path = str(path)
+    assert not console.append_to_file([{"y": 2}])
+    assert path.read_text() == '{"k": 1}'
+
+
+def test_insert_appends_in_place(console, tmp_path):
+    path = load(console, tmp_path, '[{"x": 1}]')
+    saved = path.read_text()
+    console.execute_command("insert '{\"y\": 2}'")
+    console.execute_command("insert '[{\"z\": 3}, {\"w\": [1]}]'")
+    written = path.read_text()
+    assert written.startswith(saved.rstrip()[:-1].rstrip())
+    assert json.loads(written) == [{"x": 1}, {"y": 2}, {"z": 3}, {"w": [1]}] == console.data
+
+
+@pytest.mark.parametrize("command", ["insert '[]'", "insert --batch empty.jsonl"])
+def test_empty_insert_is_rejected(console, tmp_path, command):
+    path = load(console, tmp_path, '[{"x": 1}]')
+    (tmp_path / "empty.jsonl").write_text("\n")
+    saved = path.stat().st_mtime_ns
+    result = console.execute_command(command)
+    assert result.output["error"] == ["No records to insert."]
+    assert not result.output["output"]
+    assert not console._dirty and path.stat().st_mtime_ns == saved
+
+
+def test_save_keeps_big_integers_and_non_finite_floats(console, tmp_path):
+    path = load(console, tmp_path, '[{"n": 123456789012345678901234, "v": NaN}]')
+    console.execute_command("insert '{\"w\": Infinity}'")
+    written = path.read_text()
+    assert "123456789012345678901234" in written
+    assert "NaN" in written and "Infinity" in written
+
+
+SEARCH_CACHES = [
+    "_columns", "_texts", "_fuzzy_scores", "_fuzzy_candidates", "_fuzzy_processed",
+    "_distinct", "_joined", "_joined_lower", "_index",
+]
+
+
+def test_caches_follow_inserts_and_loads(console, tmp_path):
+    load(console, tmp_path, json.dumps([{"t": "alice"}, {"t": "bob"}]))
+    searches = [
+        "search alice --field t", "search ali --field t --contains", "search ALI --field t --icontains",
+        "search a.i --field t --regex", "fuzzy_search alice --field t", "fuzzy_search alice --field t --scorer ratio",
+    ]
+    for command in searches:
+        console.execute_command(command)
+    assert all(getattr(console, name) for name in SEARCH_CACHES)
+
+    console.execute_command("insert '{\"t\": \"alicia\"}'")
+    assert output(console, "search ali --field t --contains") == ["t: alice", "t: alicia"]
+    assert output(console, "search alicia --field t") == ["t: alicia"]
+    assert output(console, "fuzzy_search alicia --field t --scorer ratio --threshold 100") == ["t: alicia"]
+
+    (tmp_path / "other.json").write_text('[{"t": "carol"}]')
+    console.execute_command("load other.json")
+    assert not any(getattr(console, name) for name in SEARCH_CACHES)
+    assert output(console, "search ali --field t --contains") == ["No matching records found."]
+
+
+def test_joined_text_offsets_follow_lowercased_values(console):
+    # "İ".lower() is two characters long, which shifts every later value in the lowercased text
+    console.data = [{"t": "xİy"}, {"t": "İİ"}, {"t": "ab"}, {"t": "Ab"}, {"t": None}, {}]
+    joined, starts, records = console.joined_text("t", lowered=True)
+    for start, text, indices in zip(starts, joined.split(json_console.JOIN_SEPARATOR), records):
+        assert joined[start:start + len(text)] == text
+        assert text == str(console.data[indices[0]]["t"]).lower()
+    assert console.substring_matches("t", "ab", lowered=True) == [2, 3]
+    assert console.substring_matches("t", "ab") == [2]
+    assert console.substring_matches("t", "y", lowered=True) == [0]
+
+
+def test_substring_matches_agree_with_a_scan(console):
+    rng = random.Random(2)
+    console.data = [{"t": "".join(rng.choice("aBİc\nd") for _ in range(rng.randint(0, 6)))} for _ in range(500)]
+    for needle in ["a", "ab", "i̇", "c\nd", "dd", "ba", "b"]:
+        for lowered in (False, True):
+            expected = [
+                idx for idx, record in enumerate(console.data)
+                if needle in (record["t"].lower() if lowered else record["t"])
+            ]
+            assert sorted(console.substring_matches("t", needle, lowered=lowered)) == expected
+
+
+@pytest.mark.parametrize("command, expected", [
+    ("search f.o --field t --contains", ["t: f.o"]),
+    ("search f.o --field t --regex", ["t: foo", "t: f.o"]),
+    # --regex takes precedence over --contains and --icontains
+    ("search f.o --field t --regex --contains", ["t: foo", "t: f.o"]),
+    ("search F.O --field t --regex --icontains", ["t: FOO"]),
+    # A literal pattern is matched as is, not lowercased
+    ("search FOO --field t --regex --icontains", ["t: FOO"]),
+    ("search foo --field t --regex --icontains", ["t: foo"]),
+    ("search FOO --field t --icontains", ["t: foo", "t: FOO"]),
+    ("search FOO --field t --contains", ["t: FOO"]),
+    ("search bar --field t --field u --contains", ["u: bar", "t: xbar"]),
+])
+def test_search_flag_combinations(console, tmp_path, command, expected):
+    records = [{"t": "foo"}, {"t": "f.o"}, {"t": "FOO"}, {"u": "bar"}, {"t": "xbar", "u": "bar"}]
+    load(console, tmp_path, json.dumps(records))
+    assert output(console, command) == expected
+
+
+def fuzzy_results(console, command):
+    return [line for line in output(console, command) for line in line.split("\n")]
+
+
+def test_fuzzy_search_rounds_scores_before_the_threshold(console, tmp_path):
+    query = "abcdefghijklmnopqrstuvwxyzabcdefghijklmnopq"
+    candidate = "abcdefghijklmnopqrstuvwxyzabcdefgZZZZZZZ"
+    assert 79.5 <= fuzz.ratio(query, candidate) < 80
+    load(console, tmp_path, json.dumps([{"t": candidate}, {"t": "zzz"}]))
+    command = f"fuzzy_search {query} --field t --scorer ratio --threshold"
+    assert fuzzy_results(console, f"{command} 80") == [f"t: {candidate}"]
+    assert fuzzy_results(console, f"{command} 81") == ["No fuzzy matching records found."]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_fuzzy_search_agrees_with_brute_force(console, tmp_path, monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(json_console, "np", None)
+    rng = random.Random(5)
+    words = sorted({"".join(rng.choice("abcde") for _ in range(rng.randint(1, 30))) for _ in range(400)})
+    load(console, tmp_path, json.dumps([{"t": word} for word in words]))
+    for query in ["abcdeabcdeabcde", "abcab", "e"]:
+        for threshold in [0, 50, 80, 95, 100]:
+            expected = sorted(
+                (-round(fuzz.ratio(query, word)), idx) for idx, word in enumerate(words)
+                if round(fuzz.ratio(query, word)) >= threshold
+            )
+            command = f"fuzzy_search {query} --field t --scorer ratio --threshold {threshold}"
+            got = fuzzy_results(console, command)
+            if not expected:
+                assert got == ["No fuzzy matching records found."]
+            else:
+                assert got == [f"t: {words[idx]}" for _, idx in expected]
+
+
+def test_fuzzy_scores_cache_is_reused_for_higher_thresholds(console):
+    console.data = [{"t": "alice", "u": "alicia"}, {"t": "bob", "u": "alice"}, {"t": "alicex"}]
+    first = console.fuzzy_scores("alice", "t", 70, "ratio")
+    assert console.fuzzy_scores("alice", "t", 90, "ratio")[2] is first[2]
+    # A lower threshold may need scores the cutoff dropped
+    lower = console.fuzzy_scores("alice", "t", 10, "ratio")
+    assert lower[2] is not first[2]
+    assert round(float(lower[2][1])) == round(fuzz.ratio("alice", "bob"))
+
+    console._fuzzy_scores.clear()
+    indices, _, scores = console.fuzzy_scores("alice", "u", 50, "ratio", skip={0})
+    assert indices == [0, 1] and scores[0] == 0 and round(float(scores[1])) == 100
+    # Partial scores are not cached
+    assert not console._fuzzy_scores
+
+
+def test_fuzzy_search_all_fields(console, tmp_path):
+    load(console, tmp_path, json.dumps([{"t": "alice", "u": "alicex"}, {"t": "bob", "u": "alice"}]))
+    command = "fuzzy_search alice --field t --field u --threshold 80 --scorer ratio"
+    assert fuzzy_results(console, command) == ["t: alice", "u: alice"]
+    # The first search did not score u for record 0; those partial scores must not be reused
+    assert fuzzy_results(console, f"{command} --all-fields") == ["t: alice", "u: alice", "u: alicex"]
+    assert fuzzy_results(console, "fuzzy_search alice --field u --threshold 80 --scorer ratio") == [
+        "u: alice", "u: alicex"
+    ]
+
+
+def test_background_save_errors_wait_for_the_next_command(console, tmp_path):
+    load(console, tmp_path, '[{"x": 1}]')
+    console.file_path = str(tmp_path / "missing" / "data.json")
+    console.append_records([{"y": 2}])
+    console._save_timer.join()
+    assert not console.cached_messages["error"]
+    errors = console.execute_command("status").output["error"]
+    assert errors and errors[0].startswith("Error writing data to")
+
+
+def test_main_reports_a_null_file(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "null.json").write_text("null")
+    monkeypatch.setattr(sys, "argv", ["jsoncli", "null.json"])
+    monkeypatch.setattr(Console, "cmdloop", lambda self: None)
+    main.main()
+    captured = capsys.readouterr()
+    assert "Launching json_console" in captured.out
+    assert "Unsupported JSON format (must be a dict or a list)." in captured.err
@@ -0,0 +1,101 @@
+import json
+import math
+
+import pytest
+
+from json_manager import json_io
+from json_manager.json_io import (
+    MMAP_MIN_SIZE, NonFiniteFloat, compile_path, dumps, loads_utf8_replace, read_json_file
+)
+
+BIG = 123456789012345678901234
+
+
+def test_compile_path():
+    access = compile_path("int.hello")
+    assert access({"int": {"hello": 0}}) == 0
+    assert access({"int": {}}) is None
+    assert access({"int": [1]}) is None
+    assert access({"int": "text"}) is None
+    assert access(None) is None
+    assert compile_path("it's")({"it's": 1}) == 1
+    assert compile_path("int.hello") is access
+
+
+def test_loads_keeps_big_integers():
+    assert loads_utf8_replace(b'{"n": 123456789012345678901234}') == {"n": BIG}
+    assert loads_utf8_replace('[123456789012345678901234]') == [BIG]
+
+
+def test_loads_marks_non_finite_floats():
+    value = loads_utf8_replace(b'[NaN, Infinity, -Infinity]')
+    assert all(isinstance(v, NonFiniteFloat) for v in value)
+    assert math.isnan(value[0])
+    assert value[1:] == [math.inf, -math.inf]
+    assert json.dumps(value) == "[NaN, Infinity, -Infinity]"
+
+
+def test_loads_replaces_invalid_utf8():
+    assert loads_utf8_replace(b'["a\xffb"]') == ["a�b"]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_writes_what_was_read(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(json_io, "orjson", None)
+    assert json.loads(dumps({"a": [1, "é"], 2: None})) == {"a": [1, "é"], "2": None}
+    assert dumps(loads_utf8_replace(b'[123456789012345678901234, NaN, -Infinity]')) == (
+        b"[123456789012345678901234, NaN, -Infinity]"
+    )
+    indented = dumps({"a": 1}, indent=True)
+    assert indented.startswith(b"{\n ") and json.loads(indented) == {"a": 1}
+
+
+def test_read_json_file(tmp_path):
+    small = tmp_path / "small.json"
+    small.write_text('[{"n": 123456789012345678901234}]')
+    assert read_json_file(str(small)) == [{"n": BIG}]
+
+    # Large enough for the memory-mapped path
+    records = [{"i": i, "s": "x" * 100} for i in range(MMAP_MIN_SIZE // 100)]
+    large = tmp_path / "large.json"
+    large.write_text(json.dumps(records))
+    assert read_json_file(str(large)) == records
+
+    large.write_text(json.dumps(records + [{"n": BIG}]))
+    assert read_json_file(str(large))[-1] == {"n": BIG}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('[{"a": 1.5, "n": 12}, {"b": "é"}]', [{"a": 1.5, "n": 12}, {"b": "é"}]),
+    ('  {"a": [1, 2], "b": {"c": null}}', {"a": [1, 2], "b": {"c": None}}),
+])
+def test_read_json_file_streams_large_files(tmp_path, monkeypatch, text, expected):
+    pytest.importorskip("ijson")
+    monkeypatch.setattr(json_io, "STREAM_MIN_SIZE", 1)
+
+    def no_full_parse(raw):
+        raise AssertionError("parsed without ijson")
+
+    monkeypatch.setattr(json_io, "loads_utf8_replace", no_full_parse)
+    path = tmp_path / "large.json"
+    path.write_text(text, encoding="utf-8")
+    data = read_json_file(str(path))
+    # Floats, not Decimals, so the data can be saved again
+    assert json.loads(json.dumps(data)) == data == expected
+
+
+@pytest.mark.parametrize("text", ['[1, 2', '{"a": }', '"text"', "null"])
+def test_stream_json_file_leaves_other_input_to_the_parser(tmp_path, monkeypatch, text):
+    pytest.importorskip("ijson")
+    monkeypatch.setattr(json_io, "STREAM_MIN_SIZE", 1)
+    path = tmp_path / "data.json"
+    path.write_text(text)
+    with open(path, "rb") as f:
+        assert json_io.stream_json_file(f) is None
+        assert f.tell() == 0
+    if text in ('"text"', "null"):
+        assert read_json_file(str(path)) == json.loads(text)
+    else:
+        with pytest.raises(ValueError):
+            read_json_file(str(path))